@@ -3,7 +3,9 @@ import logging
 from logging.handlers import RotatingFileHandler
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from config import Config
+from utils.json_provider import FastJSONProvider
 from flask_wtf.csrf import CSRFProtect
 
 
@@ -13,6 +15,7 @@ csrf = CSRFProtect()
 def create_app() -> Flask:
    app = Flask(__name__, static_folder="static", template_folder="templates")
    app.config.from_object(Config)
+   app.json = FastJSONProvider(app)
 
    db.init_app(app)
    csrf.init_app(app)
@@ -94,6 +97,31 @@ class MarketPrice(db.Model):
    price = db.Column(db.Float, nullable=False)
    location = db.Column(db.String(128))
 
+class MarketPriceRollup(db.Model):
+   __tablename__ = "market_price_rollups"
+   # Unique bucket key doubles as the lookup index for chart queries
+   __table_args__ = (
+       db.UniqueConstraint("granularity", "crop_type", "location", "period_start", name="uq_market_price_rollup_bucket"),
+   )
+   id = db.Column(db.Integer, primary_key=True)
+   granularity = db.Column(db.String(16), nullable=False)
+   crop_type = db.Column(db.String(64), nullable=False)
+   location = db.Column(db.String(128), nullable=False, default="")
+   period_start = db.Column(db.Date, nullable=False)
+   price_sum = db.Column(db.Float, nullable=False, default=0.0)
+   price_min = db.Column(db.Float, nullable=False)
+   price_max = db.Column(db.Float, nullable=False)
+   count = db.Column(db.Integer, nullable=False, default=0)
+
+@event.listens_for(db.session, "after_flush")
+def _rollup_new_market_prices(session, flush_context):
+   # Fold freshly inserted prices into the rollups inside the same transaction.
+   # Only inserts are incremental; edits/deletes of raw rows need rebuild_rollups().
+   new_rows = [obj for obj in session.new if isinstance(obj, MarketPrice)]
+   if new_rows:
+       from utils.market_rollups import apply_to_rollups
+       apply_to_rollups(session.connection(), new_rows)
+
 class Prediction(db.Model):
    __tablename__ = "predictions"
    id = db.Column(db.Integer, primary_key=True)
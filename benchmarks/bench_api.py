@@ -0,0 +1,100 @@
+"""Benchmark the real /api crop-yield routes: requests per second and allocations per request.
+
+Drives the app built by ``create_app`` through the Flask test client with the response
+cache disabled, so every request parses, validates, predicts and serializes. Each route
+is run with the app's own JSON provider and with Flask's stdlib provider for comparison.
+
+Allocation counts come from memray (``pip install memray``), which sees every
+allocation; without it only tracemalloc's peak memory per request is reported.
+
+To compare against an older revision, point ``--root`` at a checkout of it (e.g. made
+with ``git worktree add``); routes that don't exist there are skipped.
+
+    python benchmarks/bench_api.py --records 200 --requests 200
+    python benchmarks/bench_api.py --root ../baseline-worktree
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+try:
+    import memray
+except Exception:
+    memray = None
+
+ALLOC_SAMPLE = 20
+
+def make_record(rng) -> dict:
+    return {
+        "soil_type": str(rng.choice(["sandy", "loamy", "clay", "silt"])),
+        "temperature": float(rng.normal(25, 5)),
+        "humidity": float(rng.uniform(40, 90)),
+        "rainfall": float(rng.gamma(2.0, 30.0)),
+        "fertilizer_amount": float(rng.uniform(50, 250)),
+        "irrigation_frequency": int(rng.integers(1, 10)),
+    }
+
+def load_app(root: str):
+    os.environ["RESPONSE_CACHE_ENABLED"] = "0"
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    sys.path.insert(0, root)
+    from app import create_app
+    return create_app()
+
+def allocations(client, path: str, body: bytes, headers: dict) -> str:
+    if memray is not None:
+        out = os.path.join(tempfile.mkdtemp(), "allocs.bin")
+        with memray.Tracker(out, trace_python_allocators=True):
+            for _ in range(ALLOC_SAMPLE):
+                client.post(path, data=body, headers=headers)
+        meta = memray.FileReader(out).metadata
+        return f"{meta.total_allocations / ALLOC_SAMPLE:10.0f} allocs/req"
+    tracemalloc.start()
+    client.post(path, data=body, headers=headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return f"{peak / 1024:8.1f} KiB peak (install memray for allocation counts)"
+
+def run(app, label: str, path: str, body: bytes, requests: int) -> None:
+    client = app.test_client()
+    headers = {"Content-Type": "application/json"}
+    # Warm-up also trains/loads the model on first use
+    if client.post(path, data=body, headers=headers).status_code == 404:
+        print(f"{label:<42} skipped (route not in this tree)")
+        return
+    for _ in range(5):
+        client.post(path, data=body, headers=headers)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.post(path, data=body, headers=headers)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<42} {requests / elapsed:9.1f} req/s  {allocations(client, path, body, headers)}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200, help="records per batch request")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per route")
+    parser.add_argument("--root", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help="repository checkout to benchmark")
+    args = parser.parse_args()
+
+    app = load_app(os.path.abspath(args.root))
+    rng = np.random.default_rng(0)
+    single = json.dumps(make_record(rng)).encode("utf-8")
+    batch = json.dumps({"records": [make_record(rng) for _ in range(args.records)]}).encode("utf-8")
+    providers = [(type(app.json).__name__, app.json), ("DefaultJSONProvider", DefaultJSONProvider(app))]
+
+    print(f"root={args.root}  batch={args.records} records")
+    for name, provider in providers:
+        app.json = provider
+        run(app, f"crop-yield        [{name}]", "/api/predict/crop-yield", single, args.requests)
+        run(app, f"crop-yield/batch  [{name}]", "/api/predict/crop-yield/batch", batch, args.requests)
+
+if __name__ == "__main__":
+    main()
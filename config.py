@@ -21,6 +21,20 @@ class Config:
     PEST_CNN_MODEL_PATH = os.path.join(MODEL_DIR, "pest_cnn.h5")
     MARKET_ARIMA_PATH = os.path.join(MODEL_DIR, "market_arima.pkl")
 
+    # Declarative agronomic recommendation rules
+    AGRONOMIC_RULES_PATH = os.environ.get(
+        "AGRONOMIC_RULES_PATH",
+        os.path.join(os.path.dirname(__file__), "data", "agronomic_rules.json"),
+    )
+
+    # Response cache for deterministic /api endpoints ("memory" or "sqlite" for multi-worker sharing)
+    RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "1") == "1"
+    RESPONSE_CACHE_BACKEND = os.environ.get("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_PATH = os.environ.get(
+        "RESPONSE_CACHE_PATH", os.path.join(os.path.dirname(__file__), "cache", "responses.sqlite")
+    )
+
     # Plotly config
     PLOTLY_RENDERER = os.environ.get("PLOTLY_RENDERER", "browser")
 
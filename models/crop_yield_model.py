@@ -6,16 +6,21 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score
 from config import Config
-from utils.ml_utils import save_model, load_model
+from utils.ml_utils import save_model, load_model, artifact_versions
+from utils.data_preprocessing import CROP_NUMERIC_FIELDS
+from utils.rule_engine import ThresholdRuleSet, load_rules, rules_version
 
 class CropYieldPredictor:
     def __init__(self):
         self.model_path = Config.CROP_YIELD_MODEL_PATH
         self.model = None
+        self.rules = ThresholdRuleSet(load_rules("crop_yield"))
         if os.path.exists(self.model_path):
             self.model = load_model(self.model_path)
         else:
             self._train_and_save_default()
+        # Identifies the loaded model + rules; response cache keys are built from it
+        self.version = f"{artifact_versions[self.model_path]}:{rules_version()}"
 
     def _generate_synthetic_data(self, n: int = 1500) -> pd.DataFrame:
         rng = np.random.default_rng(42)
@@ -45,6 +50,12 @@ class CropYieldPredictor:
     def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
         return pd.get_dummies(df, columns=["soil_type"], drop_first=True)
 
+    def _features(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Align to the training columns instead of dropping a batch-dependent first category,
+        # so a row encodes the same way whatever else is in the batch
+        encoded = pd.get_dummies(df, columns=["soil_type"])
+        return encoded.reindex(columns=self.model.feature_names_in_, fill_value=0)
+
     def _train_and_save_default(self) -> None:
         df = self._generate_synthetic_data()
         X = self._encode(df.drop(columns=["yield"]))
@@ -62,24 +73,32 @@ class CropYieldPredictor:
         self.model = model
 
     def predict_from_json(self, payload: dict) -> dict:
-        df = pd.DataFrame([payload])
-        df = self._encode(df)
-        for col in self.model.feature_names_in_:
-            if col not in df.columns:
-                df[col] = 0
-        df = df[self.model.feature_names_in_]
-        pred = float(self.model.predict(df)[0])
-        confidence = 0.9
-        recs = []
-        if payload.get("soil_type") == "sandy":
-            recs.append("Increase organic matter to improve water retention.")
-        if float(payload.get("fertilizer_amount", 0)) < 100:
-            recs.append("Consider increasing fertilizer to optimal range (120-180 kg/ha).")
-        if float(payload.get("irrigation_frequency", 0)) < 3:
-            recs.append("Increase irrigation frequency during dry spells.")
-        return {
-            "predicted_yield": round(pred, 2),
-            "confidence_score": confidence,
-            "recommendations": recs,
-        }
+        return self.predict_batch([payload])[0]
+
+    def iter_predict_batch(self, payloads: list, values: np.ndarray = None, chunk_size: int = 256):
+        # Predict chunk by chunk so streamed batches never hold every result at once
+        for offset in range(0, len(payloads), chunk_size):
+            chunk_values = None if values is None else values[offset:offset + chunk_size]
+            results = self.predict_batch(payloads[offset:offset + chunk_size], chunk_values)
+            for i, result in enumerate(results, start=offset):
+                yield "result", {"index": i, **result}
 
+    def predict_batch(self, payloads: list, values: np.ndarray = None) -> list:
+        """``values`` is the numeric matrix from CROP_YIELD_SCHEMA.validate_batch, if already parsed."""
+        if values is None:
+            raw = pd.DataFrame(payloads)
+        else:
+            raw = pd.DataFrame(values, columns=CROP_NUMERIC_FIELDS)
+            raw["soil_type"] = [p.get("soil_type") for p in payloads]
+        df = self._features(raw)
+        preds = self.model.predict(df).round(2).tolist()
+        confidence = 0.9
+        recs = self.rules.recommend(raw)
+        return [
+            {
+                "predicted_yield": pred,
+                "confidence_score": confidence,
+                "recommendations": rec,
+            }
+            for pred, rec in zip(preds, recs)
+        ]
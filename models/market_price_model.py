@@ -1,9 +1,9 @@
 import os
 import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, List, Tuple
 from config import Config
-from utils.ml_utils import save_model, load_model
+from utils.ml_utils import save_model, load_model, artifact_versions
 import statsmodels.api as sm
 
 class MarketPricePredictor:
@@ -15,6 +15,8 @@ class MarketPricePredictor:
             # Train a baseline ARIMA on synthetic seasonal data for reliability
             self.model = self._train_default_model()
             save_model(self.model, self.model_path)
+        # Identifies the loaded model; response cache keys are built from it
+        self.version = artifact_versions[self.model_path]
 
     def _generate_series(self, periods: int = 730) -> pd.Series:
         rng = np.random.default_rng(10)
@@ -32,21 +34,28 @@ class MarketPricePredictor:
         model = sm.tsa.ARIMA(series, order=(2, 1, 2)).fit()
         return model
 
-    def forecast_from_json(self, payload: Dict) -> Dict:
-        months = 12
+    INSIGHTS = [
+        "Seasonal fluctuations indicate higher prices in late summer.",
+        "Consider forward contracts during low-price months.",
+    ]
+
+    def _monthly_forecast(self, months: int = 12) -> Tuple[List[str], np.ndarray]:
         fc = self.model.get_forecast(steps=30 * months)
-        mean = fc.predicted_mean
-        idx = pd.date_range(start=mean.index[0], periods=len(mean), freq='D')
-        by_month = mean.groupby([idx.year, idx.month]).mean()
-        prices = [round(float(v), 2) for v in by_month.values[:months]]
-        labels = [f"{y}-{m:02d}" for (y, m) in list(by_month.index)[:months]]
-        insights = [
-            "Seasonal fluctuations indicate higher prices in late summer.",
-            "Consider forward contracts during low-price months.",
-        ]
+        mean = fc.predicted_mean.to_numpy()
+        idx = pd.date_range(start=fc.predicted_mean.index[0], periods=len(mean), freq='D')
+        month_keys = idx.year.to_numpy() * 100 + idx.month.to_numpy()
+        # Boundaries of each calendar month in the (sorted) daily index
+        starts = np.flatnonzero(np.r_[True, month_keys[1:] != month_keys[:-1]])
+        counts = np.diff(np.r_[starts, len(mean)])
+        prices = np.round(np.add.reduceat(mean, starts) / counts, 2)[:months]
+        starts = starts[:months]
+        labels = [f"{k // 100}-{k % 100:02d}" for k in month_keys[starts].tolist()]
+        return labels, prices
+
+    def forecast_from_json(self, payload: Dict) -> Dict:
+        labels, prices = self._monthly_forecast()
         return {
             "predicted_prices": prices,
             "labels": labels,
-            "market_insights": insights,
+            "market_insights": self.INSIGHTS,
         }
-
@@ -1,6 +1,7 @@
 import os
 import numpy as np
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+import pandas as pd
 from PIL import Image
 try:
    import tensorflow as tf
@@ -10,11 +11,15 @@ except Exception:
    layers = None
    models = None
 from config import Config
+from utils.rule_engine import KeywordRuleSet, ThresholdRuleSet, load_rules
 
 class PestDetector:
    def __init__(self):
        self.model_path = Config.PEST_CNN_MODEL_PATH
        self.input_shape = (64, 64, 3)
+       self.priors = load_rules("pest_priors")
+       self.keyword_rules = KeywordRuleSet(load_rules("pest_keywords"))
+       self.treatment_rules = ThresholdRuleSet(load_rules("pest_treatment"))
        if tf is None:
            self.model = None
        else:
@@ -45,46 +50,38 @@ class PestDetector:
        return np.expand_dims(arr, axis=0)
 
    def detect_from_payload(self, payload: Dict, image_path: Optional[str]):
-       # Rule-based adjustment using symptoms/environment
-       symptom_text = (payload.get('symptoms') or '').lower()
-       env_text = (payload.get('environmental_conditions') or '').lower()
-       base = np.array([0.7, 0.15, 0.15])  # healthy, pest, disease base prior
-       if any(k in symptom_text for k in ["spots", "holes", "wilting", "mildew"]):
-           base = np.array([0.3, 0.4, 0.3])
-       if "humid" in env_text or "rain" in env_text:
-           base = base * np.array([1.0, 1.1, 1.2])
-       base = base / base.sum()
+       return self.detect_batch([payload], [image_path])[0]
 
-       cnn_proba = np.array([0.6, 0.2, 0.2])
-       if image_path and tf is not None and self.model is not None:
-           try:
-               inp = self._preprocess_image(image_path)
-               cnn_proba = self.model.predict(inp, verbose=0)[0]
-           except Exception:
-               pass
+   def detect_batch(self, payloads: List[Dict], image_paths: Optional[List[Optional[str]]] = None) -> List[Dict]:
+       image_paths = image_paths or [None] * len(payloads)
+       # Rule-based priors from symptoms/environment, one row per payload
+       base = self.keyword_rules.adjust(payloads, self.priors["base"])
+
+       cnn_proba = np.tile([0.6, 0.2, 0.2], (len(payloads), 1))
+       if tf is not None and self.model is not None:
+           for i, image_path in enumerate(image_paths):
+               if not image_path:
+                   continue
+               try:
+                   inp = self._preprocess_image(image_path)
+                   cnn_proba[i] = self.model.predict(inp, verbose=0)[0]
+               except Exception:
+                   pass
 
        # Combine priors and CNN output
        combined = (0.5 * base) + (0.5 * cnn_proba)
-       combined = combined / combined.sum()
-       classes = ["healthy", "pest", "disease"]
-       idx = int(np.argmax(combined))
-
-       treatment = []
-       if classes[idx] == "pest":
-           treatment = [
-               "Use integrated pest management: pheromone traps, neem oil.",
-               "Rotate crops and remove infected debris.",
-           ]
-       elif classes[idx] == "disease":
-           treatment = [
-               "Apply appropriate fungicide; ensure proper spacing and airflow.",
-               "Avoid overhead irrigation; sanitize tools.",
-           ]
-
-       return {
-           "predicted_class": classes[idx],
-           "pest_probability": float(combined[1]),
-           "disease_risk": float(combined[2]),
-           "treatment_recommendations": treatment,
-       }
+       combined = combined / combined.sum(axis=1, keepdims=True)
+       classes = np.array(self.priors["classes"])
+       predicted = classes[combined.argmax(axis=1)]
+       treatments = self.treatment_rules.recommend(pd.DataFrame({"predicted_class": predicted}))
 
+       combined = combined.tolist()
+       return [
+           {
+               "predicted_class": str(predicted[i]),
+               "pest_probability": combined[i][1],
+               "disease_risk": combined[i][2],
+               "treatment_recommendations": treatments[i],
+           }
+           for i in range(len(payloads))
+       ]
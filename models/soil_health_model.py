@@ -5,16 +5,21 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 from config import Config
-from utils.ml_utils import save_model, load_model
+from utils.ml_utils import save_model, load_model, artifact_versions
+from utils.data_preprocessing import SOIL_NUMERIC_FIELDS
+from utils.rule_engine import ThresholdRuleSet, load_rules, rules_version
 
 class SoilHealthAnalyzer:
     def __init__(self):
         self.model_path = Config.SOIL_HEALTH_MODEL_PATH
         self.model = None
+        self.rules = ThresholdRuleSet(load_rules("soil_health"))
         if os.path.exists(self.model_path):
             self.model = load_model(self.model_path)
         else:
             self._train_and_save_default()
+        # Identifies the loaded model + rules; response cache keys are built from it
+        self.version = f"{artifact_versions[self.model_path]}:{rules_version()}"
 
     def _generate_data(self, n: int = 800) -> pd.DataFrame:
         rng = np.random.default_rng(7)
@@ -60,22 +65,27 @@ class SoilHealthAnalyzer:
         self.model = clf
 
     def analyze_from_json(self, payload: dict) -> dict:
-        df = pd.DataFrame([payload])
-        proba = self.model.predict_proba(df)[0]
-        pred = int(self.model.predict(df)[0])
-        health_score = int(round((proba[2] * 100) + (proba[1] * 70) + (proba[0] * 40)))
-        status = ["poor", "fair", "good"][pred]
-        recommendations = []
-        if df.loc[0, "pH"] < 6.0:
-            recommendations.append("Apply agricultural lime to raise pH towards 6.5.")
-        if df.loc[0, "nitrogen"] < 50:
-            recommendations.append("Apply nitrogen-rich fertilizer (urea) 60-90 kg/ha.")
-        if df.loc[0, "organic_matter"] < 2.0:
-            recommendations.append("Incorporate compost/green manure to increase organic matter.")
-        return {
-            "health_score": max(0, min(100, health_score)),
-            "nutrient_status": status,
-            "fertilizer_recommendations": recommendations,
-            "probabilities": {"poor": float(proba[0]), "fair": float(proba[1]), "good": float(proba[2])},
-        }
+        return self.analyze_batch([payload])[0]
 
+    def analyze_batch(self, payloads: list, values: np.ndarray = None) -> list:
+        """``values`` is the numeric matrix from SOIL_SCHEMA.validate_batch, if already parsed."""
+        if values is None:
+            # Clients may send keys in any order; the classifier needs its training column order
+            df = pd.DataFrame(payloads).reindex(columns=SOIL_NUMERIC_FIELDS)
+        else:
+            df = pd.DataFrame(values, columns=SOIL_NUMERIC_FIELDS)
+        proba = self.model.predict_proba(df)
+        preds = proba.argmax(axis=1)
+        health_scores = np.clip(np.rint(proba @ np.array([40, 70, 100])), 0, 100).astype(int).tolist()
+        statuses = np.array(["poor", "fair", "good"])[preds].tolist()
+        recommendations = self.rules.recommend(df)
+        proba = proba.tolist()
+        return [
+            {
+                "health_score": health_scores[i],
+                "nutrient_status": statuses[i],
+                "fertilizer_recommendations": recommendations[i],
+                "probabilities": {"poor": proba[i][0], "fair": proba[i][1], "good": proba[i][2]},
+            }
+            for i in range(len(payloads))
+        ]
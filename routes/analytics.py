@@ -1,5 +1,6 @@
 import json
 import os
+from datetime import date
 from flask import Blueprint, request, jsonify, current_app, send_file
 from werkzeug.utils import secure_filename
 from models.crop_yield_model import CropYieldPredictor
@@ -7,7 +8,17 @@ from models.soil_health_model import SoilHealthAnalyzer
 from models.pest_detection_model import PestDetector
 from models.market_price_model import MarketPricePredictor
 from utils.ml_utils import model_cache
-from utils.data_preprocessing import validate_crop_yield_input, validate_soil_input, validate_market_price_input
+from utils.response_cache import cached_json_response, get_response_cache
+from utils.market_rollups import query_price_rollups
+from utils.streaming import STREAM_FORMATS, stream_events
+from utils.data_preprocessing import (
+   CROP_YIELD_SCHEMA,
+   SOIL_SCHEMA,
+   validate_crop_yield_input,
+   validate_soil_input,
+   validate_market_price_input,
+   validate_rollup_query,
+)
 
 analytics_bp = Blueprint("analytics", __name__)
 
@@ -16,7 +27,12 @@ def get_or_init_model(key: str, factory):
        model_cache[key] = factory()
    return model_cache[key]
 
+def model_version(key: str, factory):
+   # Cache keys follow the model/rules loaded in this process, not the files on disk
+   return lambda: get_or_init_model(key, factory).version
+
 @analytics_bp.route("/predict/crop-yield", methods=["POST"])
+@cached_json_response(model_version("crop_yield", CropYieldPredictor))
 def predict_crop_yield():
    try:
        data = request.get_json(force=True)
@@ -30,7 +46,44 @@ def predict_crop_yield():
        current_app.logger.exception("Crop yield prediction failed: %s", exc)
        return jsonify({"error": "Prediction failed"}), 500
 
+@analytics_bp.route("/predict/crop-yield/batch", methods=["POST"])
+@cached_json_response(model_version("crop_yield", CropYieldPredictor))
+def predict_crop_yield_batch():
+   try:
+       data = request.get_json(force=True)
+       records = data.get("records") if isinstance(data, dict) else None
+       if not isinstance(records, list) or not records:
+           return jsonify({"error": "Invalid input", "details": {"records": "Must be a non-empty list"}}), 400
+       errors, values = CROP_YIELD_SCHEMA.validate_batch(records)
+       if errors:
+           return jsonify({"error": "Invalid input", "details": {str(i): e for i, e in errors.items()}}), 400
+       model = get_or_init_model("crop_yield", CropYieldPredictor)
+       return jsonify({"results": model.predict_batch(records, values)})
+   except Exception as exc:
+       current_app.logger.exception("Batch crop yield prediction failed: %s", exc)
+       return jsonify({"error": "Prediction failed"}), 500
+
+@analytics_bp.route("/predict/crop-yield/batch/stream", methods=["POST"])
+def stream_crop_yield_batch():
+   try:
+       fmt = request.args.get("format", "ndjson")
+       if fmt not in STREAM_FORMATS:
+           return jsonify({"error": "Invalid input", "details": {"format": f"Must be one of {', '.join(STREAM_FORMATS)}"}}), 400
+       data = request.get_json(force=True)
+       records = data.get("records") if isinstance(data, dict) else None
+       if not isinstance(records, list) or not records:
+           return jsonify({"error": "Invalid input", "details": {"records": "Must be a non-empty list"}}), 400
+       errors, values = CROP_YIELD_SCHEMA.validate_batch(records)
+       if errors:
+           return jsonify({"error": "Invalid input", "details": {str(i): e for i, e in errors.items()}}), 400
+       model = get_or_init_model("crop_yield", CropYieldPredictor)
+       return stream_events(model.iter_predict_batch(records, values), fmt, "Crop yield batch")
+   except Exception as exc:
+       current_app.logger.exception("Batch crop yield stream failed: %s", exc)
+       return jsonify({"error": "Prediction failed"}), 500
+
 @analytics_bp.route("/analyze/soil-health", methods=["POST"])
+@cached_json_response(model_version("soil_health", SoilHealthAnalyzer))
 def analyze_soil_health():
    try:
        data = request.get_json(force=True)
@@ -44,6 +97,23 @@ def analyze_soil_health():
        current_app.logger.exception("Soil health analysis failed: %s", exc)
        return jsonify({"error": "Analysis failed"}), 500
 
+@analytics_bp.route("/analyze/soil-health/batch", methods=["POST"])
+@cached_json_response(model_version("soil_health", SoilHealthAnalyzer))
+def analyze_soil_health_batch():
+   try:
+       data = request.get_json(force=True)
+       records = data.get("records") if isinstance(data, dict) else None
+       if not isinstance(records, list) or not records:
+           return jsonify({"error": "Invalid input", "details": {"records": "Must be a non-empty list"}}), 400
+       errors, values = SOIL_SCHEMA.validate_batch(records)
+       if errors:
+           return jsonify({"error": "Invalid input", "details": {str(i): e for i, e in errors.items()}}), 400
+       model = get_or_init_model("soil_health", SoilHealthAnalyzer)
+       return jsonify({"results": model.analyze_batch(records, values)})
+   except Exception as exc:
+       current_app.logger.exception("Batch soil health analysis failed: %s", exc)
+       return jsonify({"error": "Analysis failed"}), 500
+
 @analytics_bp.route("/detect/pest", methods=["POST"])
 def detect_pest():
    try:
@@ -68,6 +138,7 @@ def detect_pest():
        return jsonify({"error": "Detection failed"}), 500
 
 @analytics_bp.route("/forecast/market-price", methods=["POST"])
+@cached_json_response(model_version("market_price", MarketPricePredictor))
 def forecast_market_price():
    try:
        data = request.get_json(force=True)
@@ -81,6 +152,29 @@ def forecast_market_price():
        current_app.logger.exception("Market price forecast failed: %s", exc)
        return jsonify({"error": "Forecast failed"}), 500
 
+@analytics_bp.route("/market/rollups", methods=["GET"])
+def market_price_rollups():
+   try:
+       args = request.args.to_dict()
+       valid, errors = validate_rollup_query(args)
+       if not valid:
+           return jsonify({"error": "Invalid input", "details": errors}), 400
+       result = query_price_rollups(
+           args["crop_type"],
+           locations=request.args.getlist("location") or None,
+           granularity=args.get("granularity", "monthly"),
+           start=date.fromisoformat(args["start"]) if args.get("start") else None,
+           end=date.fromisoformat(args["end"]) if args.get("end") else None,
+       )
+       return jsonify(result)
+   except Exception as exc:
+       current_app.logger.exception("Market price rollup query failed: %s", exc)
+       return jsonify({"error": "Query failed"}), 500
+
+@analytics_bp.route("/cache/stats", methods=["GET"])
+def response_cache_stats():
+   return jsonify(get_response_cache().stats())
+
 @analytics_bp.route("/data/export/<dtype>", methods=["GET"])
 def export_data(dtype: str):
    try:
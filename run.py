@@ -1,11 +1,14 @@
+import os
 from app import create_app, db
-from data.sample_data import ensure_sample_data
+from data.sample_data import ensure_sample_data, DATA_DIR
+from utils.market_rollups import seed_market_prices
 
 app = create_app()
 
 with app.app_context():
     db.create_all()
     ensure_sample_data()
+    seed_market_prices(os.path.join(DATA_DIR, "market_prices.csv"))
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -4,6 +4,16 @@
    Plotly.newPlot('cropYieldCharts', [{x, y, type:'bar', marker:{color:'#2e7d32'}}], {title:'Factors'});
  }
 
+ // Batch results arrive over a stream: start with an empty trace and extend it per chunk
+ function initBatchYieldChart() {
+   const data = [{x: [], y: [], type:'scatter', mode:'markers', marker:{color:'#2e7d32'}}];
+   Plotly.newPlot('cropYieldBatchCharts', data, {title:'Batch Predicted Yield', xaxis:{title:'Record'}, yaxis:{title:'t/ha'}});
+ }
+
+ function appendBatchYields(results) {
+   Plotly.extendTraces('cropYieldBatchCharts', {x: [results.map(r => r.index)], y: [results.map(r => r.predicted_yield)]}, [0]);
+ }
+
  function drawSoilCharts(result, inputs) {
    const categories = ['pH','N','P','K','OM','Moisture'];
    const values = [inputs.pH, inputs.nitrogen, inputs.phosphorus, inputs.potassium, inputs.organic_matter, inputs.moisture];
@@ -7,6 +7,32 @@
    return res.json();
  }
 
+ // Hands the complete NDJSON events of each network chunk to onEvents as they arrive.
+ // If onEvents throws, the stream is cancelled so the server stops the remaining work.
+ async function readNDJSON(res, onEvents) {
+   const reader = res.body.getReader();
+   const decoder = new TextDecoder();
+   let buffered = '';
+   try {
+     for (;;) {
+       const { value, done } = await reader.read();
+       buffered += decoder.decode(value, { stream: !done });
+       const lines = buffered.split('\n');
+       buffered = lines.pop();
+       const events = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+       if (events.length) onEvents(events);
+       if (done) return;
+     }
+   } catch (err) {
+     await reader.cancel();
+     throw err;
+   }
+ }
+
+ function errorMessage(result) {
+   return result.details ? `${result.error}: ${Object.keys(result.details).join(', ')}` : result.error;
+ }
+
  function serializeForm(form) {
    const data = {};
    new FormData(form).forEach((v, k) => { data[k] = v; });
@@ -33,6 +59,38 @@
      });
    }
 
+   const batchForm = document.getElementById('cropYieldBatchForm');
+   if (batchForm) {
+     batchForm.addEventListener('submit', async (e) => {
+       e.preventDefault();
+       const el = document.getElementById('cropYieldBatchResult');
+       try {
+         const records = JSON.parse(new FormData(batchForm).get('records') || '[]');
+         const res = await fetch('/api/predict/crop-yield/batch/stream?format=ndjson', {
+           method: 'POST',
+           headers: { 'Content-Type': 'application/json' },
+           body: JSON.stringify({ records })
+         });
+         if (!res.ok) throw new Error(errorMessage(await res.json()));
+         initBatchYieldChart();
+         let received = 0;
+         await readNDJSON(res, (events) => {
+           const results = events.filter(ev => ev.event === 'result').map(ev => ev.data);
+           if (results.length) {
+             appendBatchYields(results);
+             received += results.length;
+             el.innerHTML = `<div class="alert alert-info">Received ${received} of ${records.length} predictions…</div>`;
+           }
+           const failed = events.find(ev => ev.event === 'error');
+           if (failed) throw new Error(failed.data.error);
+         });
+         el.innerHTML = `<div class="alert alert-success">Predicted yield for ${received} records.</div>`;
+       } catch (err) {
+         el.innerHTML = `<div class="alert alert-danger">${err.message}</div>`;
+       }
+     });
+   }
+
    const soilForm = document.getElementById('soilHealthForm');
    if (soilForm) {
      soilForm.addEventListener('submit', async (e) => {
@@ -65,10 +123,16 @@
        e.preventDefault();
        const payload = serializeForm(priceForm);
        try { payload.historical_data = JSON.parse(payload.historical_data || '[]'); } catch { payload.historical_data = []; }
-       const result = await postJSON('/api/forecast/market-price', payload);
        const el = document.getElementById('marketPriceResult');
-       el.innerHTML = `<div class="alert alert-warning">Forecast generated for next 12 months.</div>`;
-       drawMarketCharts(result);
+       try {
+         // Buffered endpoint: the forecast is a single fast pass and this route is response-cached
+         const result = await postJSON('/api/forecast/market-price', payload);
+         if (result.error) throw new Error(errorMessage(result));
+         el.innerHTML = `<div class="alert alert-warning">Forecast generated for next 12 months.</div>`;
+         drawMarketCharts(result);
+       } catch (err) {
+         el.innerHTML = `<div class="alert alert-danger">${err.message}</div>`;
+       }
      });
    }
  });
@@ -0,0 +1,14 @@
+import pytest
+from config import Config
+from app import create_app, db
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    # Debug mode skips the rotating file log under logs/
+    monkeypatch.setattr(Config, "DEBUG", True, raising=False)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
@@ -0,0 +1,27 @@
+import pytest
+from config import Config
+from models.crop_yield_model import CropYieldPredictor
+from utils.data_preprocessing import CROP_YIELD_SCHEMA
+
+ROWS = [
+    {"soil_type": soil, "temperature": 25, "humidity": 60, "rainfall": 80, "fertilizer_amount": 150, "irrigation_frequency": 5}
+    for soil in ["loamy", "sandy", "clay", "silt"]
+]
+
+@pytest.fixture(scope="module")
+def predictor(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("models") / "crop_yield_rf.pkl")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, "CROP_YIELD_MODEL_PATH", path)
+        yield CropYieldPredictor()
+
+@pytest.mark.parametrize("batch", [ROWS, ROWS[:2], ROWS[2:], [ROWS[1], ROWS[0]]])
+def test_batch_rows_match_single_predictions(predictor, batch):
+    results = predictor.predict_batch(batch)
+    for row, result in zip(batch, results):
+        assert result == predictor.predict_from_json(row)
+
+def test_parsed_matrix_matches_dict_parsing(predictor):
+    errors, values = CROP_YIELD_SCHEMA.validate_batch(ROWS)
+    assert not errors
+    assert predictor.predict_batch(ROWS, values) == predictor.predict_batch(ROWS)
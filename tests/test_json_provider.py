@@ -0,0 +1,21 @@
+import json
+import numpy as np
+import pytest
+
+PAYLOAD = {"b": 1.5, "a": [1, 2], "c": {"z": None, "y": "x"}}
+
+@pytest.mark.parametrize("kwargs", [
+    {"separators": (", ", ": ")},
+    {"separators": (",", ":")},
+    {"indent": 2},
+    {"indent": 2, "separators": (",", ":")},
+    {"indent": 4},
+])
+def test_dumps_honours_stdlib_formatting(app, kwargs):
+    assert app.json.dumps(PAYLOAD, **kwargs) == json.dumps(PAYLOAD, sort_keys=True, **kwargs)
+
+def test_numpy_values_serialize_natively(app):
+    assert json.loads(app.json.dumps({"v": np.round(np.array([1.234, 2.0]), 2), "n": np.int64(3)})) == {
+        "v": [1.23, 2.0],
+        "n": 3,
+    }
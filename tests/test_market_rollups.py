@@ -0,0 +1,80 @@
+from datetime import date
+import pytest
+from app import db, MarketPrice, MarketPriceRollup
+from utils import market_rollups
+from utils.market_rollups import ingest_market_prices, query_price_rollups, rebuild_rollups
+
+PRICES = [
+    {"crop_type": "wheat", "date": "2024-01-01", "price": 10.0, "location": "North"},
+    {"crop_type": "wheat", "date": "2024-01-03", "price": 14.0, "location": "North"},
+    {"crop_type": "wheat", "date": "2024-02-05", "price": 20.0, "location": "North"},
+    {"crop_type": "wheat", "date": "2024-01-02", "price": 30.0, "location": "South"},
+    {"crop_type": "wheat", "date": "2024-01-02", "price": 5.0, "location": None},
+    {"crop_type": "rice", "date": "2024-01-02", "price": 40.0, "location": "North"},
+]
+
+def rollup_rows():
+    return sorted(
+        (r.granularity, r.crop_type, r.location, r.period_start, r.price_sum, r.price_min, r.price_max, r.count)
+        for r in MarketPriceRollup.query.all()
+    )
+
+def bucket(granularity, location, start, crop_type="wheat"):
+    return MarketPriceRollup.query.filter_by(
+        granularity=granularity, crop_type=crop_type, location=location, period_start=start
+    ).one()
+
+def test_flush_hook_merges_buckets_across_flushes(app):
+    ingest_market_prices(PRICES[:1])
+    ingest_market_prices(PRICES[1:3])
+    january = bucket("monthly", "North", date(2024, 1, 1))
+    assert (january.price_sum, january.price_min, january.price_max, january.count) == (24.0, 10.0, 14.0, 2)
+    week = bucket("weekly", "North", date(2024, 1, 1))
+    assert week.count == 2
+    assert bucket("daily", "North", date(2024, 1, 3)).price_sum == 14.0
+
+def test_missing_location_is_its_own_bucket(app):
+    ingest_market_prices(PRICES)
+    assert bucket("monthly", "", date(2024, 1, 1)).price_sum == 5.0
+
+def test_rollback_discards_rollups(app):
+    db.session.add(MarketPrice(crop_type="wheat", date=date(2024, 1, 1), price=10.0, location="North"))
+    db.session.flush()
+    assert MarketPriceRollup.query.count() == 3
+    db.session.rollback()
+    assert MarketPriceRollup.query.count() == 0
+
+def test_rebuild_matches_incremental_rollups(app):
+    ingest_market_prices(PRICES[:3])
+    ingest_market_prices(PRICES[3:])
+    incremental = rollup_rows()
+    rebuild_rollups(batch_size=2)
+    assert rollup_rows() == incremental
+
+def test_merge_fallback_matches_upsert(app, monkeypatch):
+    ingest_market_prices(PRICES)
+    ingest_market_prices(PRICES[:2])
+    upserted = rollup_rows()
+    monkeypatch.setattr(market_rollups, "_UPSERT_DIALECTS", ())
+    rebuild_rollups(batch_size=2)
+    assert rollup_rows() == upserted
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, {"North": ["2024-01-01", "2024-02-01"], "South": ["2024-01-01"], "": ["2024-01-01"]}),
+    ({"locations": ["North"]}, {"North": ["2024-01-01", "2024-02-01"]}),
+    ({"start": date(2024, 1, 20)}, {"North": ["2024-01-01", "2024-02-01"], "South": ["2024-01-01"], "": ["2024-01-01"]}),
+    ({"start": date(2024, 2, 1)}, {"North": ["2024-02-01"]}),
+    ({"end": date(2024, 1, 31)}, {"North": ["2024-01-01"], "South": ["2024-01-01"], "": ["2024-01-01"]}),
+])
+def test_query_filters_by_location_and_period(app, kwargs, expected):
+    ingest_market_prices(PRICES)
+    result = query_price_rollups("wheat", **kwargs)
+    assert {s["location"]: s["labels"] for s in result["series"]} == expected
+
+def test_query_reports_bucket_stats(app):
+    ingest_market_prices(PRICES)
+    north = query_price_rollups("wheat", locations=["North"])["series"][0]
+    assert north["mean"] == [12.0, 20.0]
+    assert north["min"] == [10.0, 20.0]
+    assert north["max"] == [14.0, 20.0]
+    assert north["count"] == [2, 1]
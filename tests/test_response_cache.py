@@ -0,0 +1,75 @@
+import itertools
+from types import SimpleNamespace
+import pytest
+from config import Config
+from utils import response_cache
+from utils.ml_utils import model_cache
+from utils.response_cache import LRUBackend, SQLiteBackend
+
+SOIL = {"pH": 6.5, "nitrogen": 60, "phosphorus": 30, "potassium": 150, "organic_matter": 3.0, "moisture": 30}
+
+@pytest.fixture
+def client(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SOIL_HEALTH_MODEL_PATH", str(tmp_path / "soil_health_clf.pkl"))
+    app.config.update(RESPONSE_CACHE_ENABLED=True, RESPONSE_CACHE_BACKEND="memory")
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+    monkeypatch.delitem(model_cache, "soil_health", raising=False)
+    return app.test_client()
+
+@pytest.fixture
+def clock(monkeypatch):
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+def test_miss_hit_not_modified_and_stats(client):
+    first = client.post("/api/analyze/soil-health", json=SOIL)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    # Key order doesn't change the cache key
+    second = client.post("/api/analyze/soil-health", json=dict(reversed(list(SOIL.items()))))
+    assert second.status_code == 200
+    assert second.headers["ETag"] == etag
+    assert second.get_data() == first.get_data()
+
+    revalidated = client.post("/api/analyze/soil-health", json=SOIL, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b""
+
+    stats = client.get("/api/cache/stats").get_json()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["not_modified"]) == (1, 2, 1, 1)
+
+def test_invalid_input_is_not_cached(client):
+    assert client.post("/api/analyze/soil-health", json={"pH": 6.5}).status_code == 400
+    assert client.get("/api/cache/stats").get_json()["entries"] == 0
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUBackend(max_entries=2)
+    backend.set("a", ("1", b"a"))
+    backend.set("b", ("2", b"b"))
+    backend.get("a")
+    backend.set("c", ("3", b"c"))
+    assert backend.get("b") is None
+    assert backend.get("a") == ("1", b"a")
+    assert len(backend) == 2
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path, clock, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "responses.sqlite"), max_entries=2)
+    backend.set("a", ("1", b"a"))
+    backend.set("b", ("2", b"b"))
+    monkeypatch.setattr(response_cache, "SQLITE_TOUCH_INTERVAL", 0.0)
+    assert backend.get("a") == ("1", b"a")
+    backend.set("c", ("3", b"c"))
+    assert backend.get("b") is None
+    assert backend.get("a") == ("1", b"a")
+    assert len(backend) == 2
+
+def test_sqlite_backend_skips_recent_touches(tmp_path, clock):
+    backend = SQLiteBackend(str(tmp_path / "responses.sqlite"), max_entries=2)
+    backend.set("a", ("1", b"a"))
+    backend.set("b", ("2", b"b"))
+    # Read within the touch interval: "a" keeps its old last_used and is evicted first
+    assert backend.get("a") == ("1", b"a")
+    backend.set("c", ("3", b"c"))
+    assert backend.get("a") is None
+    assert backend.get("b") == ("2", b"b")
@@ -0,0 +1,21 @@
+import numpy as np
+from utils.rule_engine import KeywordRuleSet, load_rules
+
+def test_overlapping_keywords_fire_independently():
+    rules = KeywordRuleSet([
+        {"field": "environmental_conditions", "keywords": ["rain"], "scale": [1.0, 1.0, 2.0]},
+        {"field": "environmental_conditions", "keywords": ["rainfall"], "scale": [1.0, 2.0, 1.0]},
+    ])
+    mask = rules.evaluate([{"environmental_conditions": "Heavy RAINFALL"}, {"environmental_conditions": None}])
+    assert mask.tolist() == [[True, True], [False, False]]
+
+def test_default_pest_priors_match_previous_rules():
+    rules = KeywordRuleSet(load_rules("pest_keywords"))
+    base = load_rules("pest_priors")["base"]
+    priors = rules.adjust(
+        [{"symptoms": "leaf spots", "environmental_conditions": "humid"}, {"symptoms": "", "environmental_conditions": "dry"}],
+        base,
+    )
+    wet = np.array([0.3, 0.4, 0.3]) * [1.0, 1.1, 1.2]
+    assert np.allclose(priors[0], wet / wet.sum())
+    assert np.allclose(priors[1], [0.7, 0.15, 0.15])
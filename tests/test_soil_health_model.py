@@ -0,0 +1,32 @@
+import pytest
+from config import Config
+from models.soil_health_model import SoilHealthAnalyzer
+from utils.data_preprocessing import SOIL_SCHEMA
+
+ROWS = [
+    {"pH": 6.5, "nitrogen": 60, "phosphorus": 30, "potassium": 150, "organic_matter": 3.0, "moisture": 30},
+    {"pH": 5.2, "nitrogen": 25, "phosphorus": 8, "potassium": 60, "organic_matter": 1.2, "moisture": 12},
+    {"pH": 7.9, "nitrogen": 110, "phosphorus": 55, "potassium": 280, "organic_matter": 5.5, "moisture": 50},
+]
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("models") / "soil_health_clf.pkl")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, "SOIL_HEALTH_MODEL_PATH", path)
+        yield SoilHealthAnalyzer()
+
+@pytest.mark.parametrize("batch", [ROWS, ROWS[:1], [ROWS[2], ROWS[0]]])
+def test_batch_rows_match_single_analysis(analyzer, batch):
+    results = analyzer.analyze_batch(batch)
+    for row, result in zip(batch, results):
+        assert result == analyzer.analyze_from_json(row)
+
+def test_key_order_does_not_matter(analyzer):
+    shuffled = [dict(sorted(row.items())) for row in ROWS]
+    assert analyzer.analyze_batch(shuffled) == analyzer.analyze_batch(ROWS)
+
+def test_parsed_matrix_matches_dict_parsing(analyzer):
+    errors, values = SOIL_SCHEMA.validate_batch(ROWS)
+    assert not errors
+    assert analyzer.analyze_batch(ROWS, values) == analyzer.analyze_batch(ROWS)
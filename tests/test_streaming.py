@@ -0,0 +1,36 @@
+import json
+import pytest
+from config import Config
+from utils.ml_utils import model_cache
+
+RECORDS = [
+    {"soil_type": soil, "temperature": 25, "humidity": 60, "rainfall": 80, "fertilizer_amount": 150, "irrigation_frequency": 5}
+    for soil in ["loamy", "sandy", "clay", "silt"]
+]
+
+@pytest.fixture
+def client(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CROP_YIELD_MODEL_PATH", str(tmp_path / "crop_yield_rf.pkl"))
+    monkeypatch.delitem(model_cache, "crop_yield", raising=False)
+    app.config.update(RESPONSE_CACHE_ENABLED=False)
+    return app.test_client()
+
+def test_batch_stream_matches_buffered_batch(client):
+    resp = client.post("/api/predict/crop-yield/batch/stream?format=ndjson", json={"records": RECORDS})
+    assert resp.mimetype == "application/x-ndjson"
+    events = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert events[-1] == {"event": "done", "data": {"events": len(RECORDS)}}
+
+    buffered = client.post("/api/predict/crop-yield/batch", json={"records": RECORDS}).get_json()["results"]
+    assert [e["data"] for e in events[:-1]] == [{"index": i, **r} for i, r in enumerate(buffered)]
+
+def test_batch_stream_as_sse(client):
+    resp = client.post("/api/predict/crop-yield/batch/stream?format=sse", json={"records": RECORDS[:1]})
+    assert resp.mimetype == "text/event-stream"
+    assert resp.get_data(as_text=True).startswith("event: result\ndata: ")
+
+def test_batch_stream_rejects_bad_input_before_streaming(client):
+    assert client.post("/api/predict/crop-yield/batch/stream?format=xml", json={"records": RECORDS}).status_code == 400
+    resp = client.post("/api/predict/crop-yield/batch/stream", json={"records": [{"soil_type": "loamy"}]})
+    assert resp.status_code == 400
+    assert "0" in resp.get_json()["details"]
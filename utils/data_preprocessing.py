@@ -1,4 +1,7 @@
-from typing import Tuple, Dict, Any
+from datetime import date
+from typing import Tuple, Dict, Any, List, Optional
+import numpy as np
+from utils.market_rollups import GRANULARITIES
 
 REQUIRED_CROP_FIELDS = [
     "soil_type",
@@ -20,43 +23,96 @@ REQUIRED_SOIL_FIELDS = [
 
 REQUIRED_MARKET_FIELDS = ["crop_type", "season", "location", "historical_data"]
 
-def validate_crop_yield_input(data: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
-    errors = {}
-    for field in REQUIRED_CROP_FIELDS:
-        if field not in data:
-            errors[field] = "Missing"
-    numeric_fields = [
-        "temperature",
-        "humidity",
-        "rainfall",
-        "fertilizer_amount",
-        "irrigation_frequency",
-    ]
-    for nf in numeric_fields:
+CROP_NUMERIC_FIELDS = [
+    "temperature",
+    "humidity",
+    "rainfall",
+    "fertilizer_amount",
+    "irrigation_frequency",
+]
+
+SOIL_NUMERIC_FIELDS = ["pH", "nitrogen", "phosphorus", "potassium", "organic_matter", "moisture"]
+
+class PayloadSchema:
+    """Required/numeric field spec compiled once and applied to a payload or batch in one pass.
+
+    Valid batches are parsed with a single NumPy conversion; the per-field checks only run
+    to build error messages when that conversion fails.
+    """
+
+    def __init__(self, required, numeric=()):
+        self.required = tuple(required)
+        self.numeric = tuple(numeric)
+        self._required_set = frozenset(self.required)
+
+    def _record_errors(self, data: Any) -> Dict[str, str]:
+        if not isinstance(data, dict):
+            return {"payload": "Must be a JSON object"}
+        errors = {}
+        for field in self.required:
+            if field not in data:
+                errors[field] = "Missing"
+        for nf in self.numeric:
+            try:
+                float(data.get(nf, ""))
+            except Exception:
+                errors[nf] = "Must be numeric"
+        return errors
+
+    def _parse(self, records: List[Any]) -> Optional[np.ndarray]:
+        if not all(isinstance(r, dict) and r.keys() >= self._required_set for r in records):
+            return None
+        raw = np.array([[r.get(f) for f in self.numeric] for r in records], dtype=object)
+        if raw.shape != (len(records), len(self.numeric)) or np.equal(raw, None).any():
+            return None
         try:
-            float(data.get(nf, ""))
-        except Exception:
-            errors[nf] = "Must be numeric"
-    return (len(errors) == 0, errors)
+            return raw.astype(float)
+        except (TypeError, ValueError):
+            return None
+
+    def validate_batch(self, records: List[Any]) -> Tuple[Dict[int, Dict[str, str]], Optional[np.ndarray]]:
+        """Return per-record errors and, when every record is valid, the parsed numeric matrix."""
+        values = self._parse(records)
+        if values is not None:
+            return {}, values
+        errors = {}
+        for i, rec in enumerate(records):
+            rec_errors = self._record_errors(rec)
+            if rec_errors:
+                errors[i] = rec_errors
+        return errors, None
+
+    def validate(self, data: Any) -> Tuple[bool, Dict[str, str]]:
+        # A single record is cheaper to check field by field than to route through NumPy
+        errors = self._record_errors(data)
+        return (len(errors) == 0, errors)
+
+CROP_YIELD_SCHEMA = PayloadSchema(REQUIRED_CROP_FIELDS, CROP_NUMERIC_FIELDS)
+SOIL_SCHEMA = PayloadSchema(REQUIRED_SOIL_FIELDS, SOIL_NUMERIC_FIELDS)
+MARKET_SCHEMA = PayloadSchema(REQUIRED_MARKET_FIELDS)
+
+def validate_crop_yield_input(data: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
+    return CROP_YIELD_SCHEMA.validate(data)
 
 def validate_soil_input(data: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
-    errors = {}
-    for field in REQUIRED_SOIL_FIELDS:
-        if field not in data:
-            errors[field] = "Missing"
-    numeric_fields = ["pH", "nitrogen", "phosphorus", "potassium", "organic_matter", "moisture"]
-    for nf in numeric_fields:
-        try:
-            float(data.get(nf, ""))
-        except Exception:
-            errors[nf] = "Must be numeric"
-    return (len(errors) == 0, errors)
+    return SOIL_SCHEMA.validate(data)
 
 def validate_market_price_input(data: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
+    return MARKET_SCHEMA.validate(data)
+
+def validate_rollup_query(args: Dict[str, Any]) -> Tuple[bool, Dict[str, str]]:
     errors = {}
-    for field in REQUIRED_MARKET_FIELDS:
-        if field not in data:
-            errors[field] = "Missing"
+    if not args.get("crop_type"):
+        errors["crop_type"] = "Missing"
+    granularity = args.get("granularity", "monthly")
+    if granularity not in GRANULARITIES:
+        errors["granularity"] = f"Must be one of {', '.join(GRANULARITIES)}"
+    for df in ["start", "end"]:
+        if args.get(df):
+            try:
+                date.fromisoformat(args[df])
+            except Exception:
+                errors[df] = "Must be an ISO date (YYYY-MM-DD)"
     return (len(errors) == 0, errors)
 
 def preprocess_data(df):
@@ -0,0 +1,78 @@
+import json
+from typing import Any
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+def _default(o: Any) -> Any:
+    # NumPy containers are converted in C via tolist() instead of element by element
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.generic):
+        return o.item()
+    return DefaultJSONProvider.default(o)
+
+# Dates go through _default so they match Flask's stdlib output (HTTP dates)
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+) if orjson is not None else 0
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson when installed, falling back to the stdlib encoder.
+
+    Both paths serialize NumPy arrays and scalars natively, so predictors can return
+    arrays without casting each value back to a Python float. With orjson installed,
+    compact, pretty (debug) and plain ``dumps`` output all go through orjson and honour
+    ``sort_keys``, so the JSON doesn't change with the code path (NaN is written as null,
+    and ``loads`` rejects the ``NaN``/``Infinity`` literals the stdlib parser accepts).
+    orjson is optional; install it separately.
+    """
+
+    def _orjson_option(self, indent: Any = None, sort_keys: Any = None) -> int:
+        option = _ORJSON_OPTIONS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _use_orjson(self, kwargs: dict) -> bool:
+        # orjson covers Flask's own call patterns; anything else goes to the stdlib encoder
+        if orjson is None or not set(kwargs) <= {"indent", "sort_keys", "separators"}:
+            return False
+        indent = kwargs.get("indent")
+        if indent not in (None, 2):
+            return False
+        # orjson can't change its separators, so only take explicit ones it already writes
+        separators = kwargs.get("separators")
+        return separators is None or tuple(separators) == ((",", ": ") if indent else (",", ":"))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self._use_orjson(kwargs):
+            option = self._orjson_option(kwargs.get("indent"), kwargs.get("sort_keys"))
+            return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is not None:
+            # Hand orjson's bytes straight to the response, skipping a str round trip
+            option = self._orjson_option(indent=2 if pretty else None) | orjson.OPT_APPEND_NEWLINE
+            body = orjson.dumps(obj, default=_default, option=option)
+        elif pretty:
+            body = self.dumps(obj, indent=2) + "\n"
+        else:
+            body = self.dumps(obj, separators=(",", ":")) + "\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
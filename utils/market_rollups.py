@@ -0,0 +1,218 @@
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+from sqlalchemy import and_, func, select
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from app import db, MarketPrice, MarketPriceRollup
+
+GRANULARITIES = ("daily", "weekly", "monthly")
+
+def period_start(day: date, granularity: str) -> date:
+    if granularity == "daily":
+        return day
+    if granularity == "weekly":
+        return day - timedelta(days=day.weekday())
+    if granularity == "monthly":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+_UPSERT_CHUNK = 100
+
+_UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+def _upsert_statement(dialect: str, values: List[Dict[str, Any]]):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        lower, upper = func.least, func.greatest
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        lower, upper = func.min, func.max
+    table = MarketPriceRollup.__table__
+    stmt = insert(table).values(values)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.granularity, table.c.crop_type, table.c.location, table.c.period_start],
+        set_={
+            "price_sum": table.c.price_sum + excluded.price_sum,
+            "price_min": lower(table.c.price_min, excluded.price_min),
+            "price_max": upper(table.c.price_max, excluded.price_max),
+            "count": table.c.count + excluded.count,
+        },
+    )
+
+def _merge_rollups(connection, values: List[Dict[str, Any]]) -> None:
+    # Read-modify-write fallback for databases without ON CONFLICT upserts. Concurrent
+    # writers to the same bucket can race here, so run rebuild_rollups() if that matters.
+    table = MarketPriceRollup.__table__
+    for v in values:
+        bucket = and_(
+            table.c.granularity == v["granularity"],
+            table.c.crop_type == v["crop_type"],
+            table.c.location == v["location"],
+            table.c.period_start == v["period_start"],
+        )
+        row = connection.execute(
+            select(table.c.price_sum, table.c.price_min, table.c.price_max, table.c.count).where(bucket)
+        ).first()
+        if row is None:
+            connection.execute(table.insert().values(**v))
+        else:
+            connection.execute(table.update().where(bucket).values(
+                price_sum=row.price_sum + v["price_sum"],
+                price_min=min(row.price_min, v["price_min"]),
+                price_max=max(row.price_max, v["price_max"]),
+                count=row.count + v["count"],
+            ))
+
+def apply_to_rollups(connection, rows: Iterable[Any]) -> None:
+    # Fold rows into per-bucket deltas first so a bulk ingest touches each rollup row once,
+    # then add them with a SQL-side upsert so concurrent writers can't lose updates
+    deltas: Dict[tuple, List[float]] = {}
+    for row in rows:
+        day = _as_date(row.date)
+        price = float(row.price)
+        for granularity in GRANULARITIES:
+            key = (granularity, row.crop_type, row.location or "", period_start(day, granularity))
+            acc = deltas.get(key)
+            if acc is None:
+                deltas[key] = [price, price, price, 1]
+            else:
+                acc[0] += price
+                acc[1] = min(acc[1], price)
+                acc[2] = max(acc[2], price)
+                acc[3] += 1
+    if not deltas:
+        return
+
+    values = [
+        {
+            "granularity": granularity,
+            "crop_type": crop_type,
+            "location": location,
+            "period_start": start,
+            "price_sum": total,
+            "price_min": lo,
+            "price_max": hi,
+            "count": n,
+        }
+        for (granularity, crop_type, location, start), (total, lo, hi, n) in deltas.items()
+    ]
+    dialect = connection.dialect.name
+    if dialect not in _UPSERT_DIALECTS:
+        _merge_rollups(connection, values)
+        return
+    for i in range(0, len(values), _UPSERT_CHUNK):
+        connection.execute(_upsert_statement(dialect, values[i:i + _UPSERT_CHUNK]))
+
+def ingest_market_prices(records: Iterable[Dict[str, Any]]) -> int:
+    rows = [
+        MarketPrice(
+            crop_type=r["crop_type"],
+            date=_as_date(r["date"]),
+            price=float(r["price"]),
+            location=r.get("location"),
+        )
+        for r in records
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return len(rows)
+
+def rebuild_rollups(batch_size: int = 5000) -> None:
+    connection = db.session.connection()
+    connection.execute(MarketPriceRollup.__table__.delete())
+    batch = []
+    raw = db.session.query(
+        MarketPrice.crop_type, MarketPrice.date, MarketPrice.price, MarketPrice.location
+    ).yield_per(batch_size)
+    for row in raw:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            apply_to_rollups(connection, batch)
+            batch = []
+    apply_to_rollups(connection, batch)
+    db.session.commit()
+
+@contextmanager
+def _seed_lock(path: str):
+    # Every gunicorn worker runs the startup seeding; serialize them so only one ingests
+    with open(path, "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+def seed_market_prices(csv_path: str) -> None:
+    with _seed_lock(os.path.join(os.path.dirname(csv_path), ".market_prices_seed.lock")):
+        if db.session.query(MarketPrice.id).first() is not None:
+            # Databases created before rollups existed have raw rows but empty buckets
+            if db.session.query(MarketPriceRollup.id).first() is None:
+                rebuild_rollups()
+            return
+        if os.path.exists(csv_path):
+            df = pd.read_csv(csv_path)
+            ingest_market_prices(df.to_dict("records"))
+
+def query_price_rollups(
+    crop_type: str,
+    locations: Optional[List[str]] = None,
+    granularity: str = "monthly",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict:
+    q = db.session.query(
+        MarketPriceRollup.location,
+        MarketPriceRollup.period_start,
+        MarketPriceRollup.price_sum,
+        MarketPriceRollup.price_min,
+        MarketPriceRollup.price_max,
+        MarketPriceRollup.count,
+    ).filter(
+        MarketPriceRollup.granularity == granularity,
+        MarketPriceRollup.crop_type == crop_type,
+    )
+    if locations:
+        q = q.filter(MarketPriceRollup.location.in_(locations))
+    if start is not None:
+        q = q.filter(MarketPriceRollup.period_start >= period_start(start, granularity))
+    if end is not None:
+        q = q.filter(MarketPriceRollup.period_start <= end)
+    q = q.order_by(MarketPriceRollup.location, MarketPriceRollup.period_start)
+
+    series: Dict[str, Dict[str, list]] = {}
+    for location, start_day, total, lo, hi, n in q:
+        s = series.get(location)
+        if s is None:
+            s = series[location] = {
+                "location": location,
+                "labels": [],
+                "mean": [],
+                "min": [],
+                "max": [],
+                "count": [],
+            }
+        s["labels"].append(start_day.isoformat())
+        s["mean"].append(round(total / n, 2) if n else None)
+        s["min"].append(round(lo, 2))
+        s["max"].append(round(hi, 2))
+        s["count"].append(n)
+    return {
+        "crop_type": crop_type,
+        "granularity": granularity,
+        "series": list(series.values()),
+    }
@@ -1,15 +1,26 @@
+import hashlib
 import os
 import pickle
 from typing import Any
 
 model_cache = {}
 
+# Content hash of each artifact as it was loaded/saved by this process
+artifact_versions = {}
+
+def content_version(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
 def save_model(model: Any, path: str) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = pickle.dumps(model)
     with open(path, "wb") as f:
-        pickle.dump(model, f)
+        f.write(data)
+    artifact_versions[path] = content_version(data)
 
 def load_model(path: str) -> Any:
     with open(path, "rb") as f:
-        return pickle.load(f)
+        data = f.read()
+    artifact_versions[path] = content_version(data)
+    return pickle.loads(data)
 
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from functools import wraps
+from typing import Callable, Optional, Tuple
+from flask import current_app, make_response, request
+
+CacheEntry = Tuple[str, bytes]  # (etag, body)
+
+class LRUBackend:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+# A hit only refreshes last_used once it is this stale, so hot keys don't take the
+# database write lock shared by all workers on every read
+SQLITE_TOUCH_INTERVAL = 60.0
+
+class SQLiteBackend:
+    """Shared cache file so every gunicorn worker sees the same entries.
+
+    Eviction is least-recently-used to within ``SQLITE_TOUCH_INTERVAL`` seconds.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_last_used ON response_cache (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT etag, body, last_used FROM response_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[2] > SQLITE_TOUCH_INTERVAL:
+                conn.execute("UPDATE response_cache SET last_used = ? WHERE key = ?", (now, key))
+            return row[0], bytes(row[1])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, etag, body, last_used) VALUES (?, ?, ?, ?)",
+                (key, entry[0], entry[1], time.time()),
+            )
+            conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+        # Counters are per worker process; with the SQLite backend only the entries are shared
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def record(self, hit: bool, not_modified: bool = False) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if not_modified:
+                self.not_modified += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, not_modified = self.hits, self.misses, self.not_modified
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "counters_scope": "worker",
+            "worker_pid": os.getpid(),
+            "hits": hits,
+            "misses": misses,
+            "not_modified": not_modified,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        cfg = current_app.config
+        max_entries = cfg["RESPONSE_CACHE_MAX_ENTRIES"]
+        if cfg["RESPONSE_CACHE_BACKEND"] == "sqlite":
+            backend = SQLiteBackend(cfg["RESPONSE_CACHE_PATH"], max_entries)
+        else:
+            backend = LRUBackend(max_entries)
+        _response_cache = ResponseCache(backend)
+    return _response_cache
+
+def cache_key(payload, version: str) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256()
+    digest.update(request.path.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+def _respond(etag: str, body: bytes):
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(body)
+        resp.mimetype = "application/json"
+    resp.set_etag(etag)
+    return resp
+
+def cached_json_response(version_fn: Callable[[], str]):
+    """Cache a deterministic JSON POST endpoint keyed on its body and ``version_fn()``.
+
+    ``version_fn`` must identify the model/rules the view will actually use in this
+    process, so a stale in-memory model can never be cached under a new version.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get("RESPONSE_CACHE_ENABLED", True):
+                return view(*args, **kwargs)
+            payload = request.get_json(force=True, silent=True)
+            if payload is None:
+                return view(*args, **kwargs)
+            try:
+                version = version_fn()
+            except Exception:
+                # Let the view load the model itself and report the failure its own way
+                return view(*args, **kwargs)
+            cache = get_response_cache()
+            key = cache_key(payload, version)
+            entry = cache.backend.get(key)
+            if entry is not None:
+                cache.record(hit=True, not_modified=request.if_none_match.contains(entry[0]))
+                return _respond(*entry)
+
+            cache.record(hit=False)
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+            body = resp.get_data()
+            etag = hashlib.sha256(body).hexdigest()
+            cache.backend.set(key, (etag, body))
+            return _respond(etag, body)
+        return wrapper
+    return decorator
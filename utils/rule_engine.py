@@ -0,0 +1,117 @@
+import json
+import operator
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from config import Config
+from utils.ml_utils import content_version
+
+OPERATORS = {
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "eq": operator.eq,
+    "ne": operator.ne,
+}
+
+_rules_cache: Dict[str, Dict[str, list]] = {}
+_rules_versions: Dict[str, str] = {}
+
+def load_rules(section: str, path: str = None) -> List[Dict[str, Any]]:
+    path = path or Config.AGRONOMIC_RULES_PATH
+    if path not in _rules_cache:
+        with open(path, "rb") as f:
+            data = f.read()
+        _rules_cache[path] = json.loads(data)
+        _rules_versions[path] = content_version(data)
+    return _rules_cache[path].get(section, [])
+
+def rules_version(path: str = None) -> str:
+    """Content hash of the rules this process loaded (not of the file currently on disk)."""
+    path = path or Config.AGRONOMIC_RULES_PATH
+    load_rules("", path)
+    return _rules_versions[path]
+
+class ThresholdRuleSet:
+    """Compiles feature/threshold rules into boolean NumPy masks over a batch of rows."""
+
+    def __init__(self, rules: Sequence[Dict[str, Any]]):
+        for rule in rules:
+            if rule["op"] not in OPERATORS:
+                raise ValueError(f"Unknown rule operator: {rule['op']}")
+        self.rules = list(rules)
+        self.messages = np.array([r["message"] for r in self.rules], dtype=object)
+
+    def _column(self, frame: pd.DataFrame, rule: Dict[str, Any]) -> np.ndarray:
+        if rule["feature"] in frame.columns:
+            col = frame[rule["feature"]]
+        else:
+            col = pd.Series([None] * len(frame), index=frame.index, dtype=object)
+        if isinstance(rule["value"], str):
+            return col.fillna(rule.get("default", "")).to_numpy(dtype=object)
+        col = pd.to_numeric(col, errors="coerce")
+        if "default" in rule:
+            col = col.fillna(rule["default"])
+        return col.to_numpy(dtype=float)
+
+    def evaluate(self, frame: pd.DataFrame) -> np.ndarray:
+        """Return a (rows, rules) boolean mask of which rules fire for each row."""
+        mask = np.zeros((len(frame), len(self.rules)), dtype=bool)
+        columns = {}
+        for j, rule in enumerate(self.rules):
+            key = (rule["feature"], isinstance(rule["value"], str), str(rule.get("default")))
+            if key not in columns:
+                columns[key] = self._column(frame, rule)
+            mask[:, j] = OPERATORS[rule["op"]](columns[key], rule["value"])
+        return mask
+
+    def recommend(self, frame: pd.DataFrame) -> List[List[str]]:
+        mask = self.evaluate(frame)
+        return [self.messages[row].tolist() for row in mask]
+
+class KeywordRuleSet:
+    """Compiles keyword rules into one regex and applies their prior adjustments per row.
+
+    Each rule is an optional zero-width lookahead, so every rule is tested against the
+    whole text independently and overlapping keywords can't hide one another. A rule
+    either replaces the prior (``set``) or multiplies it (``scale``); rules apply in
+    file order.
+    """
+
+    def __init__(self, rules: Sequence[Dict[str, Any]]):
+        self.rules = list(rules)
+        for rule in self.rules:
+            if "set" not in rule and "scale" not in rule:
+                raise ValueError(f"Keyword rule {rule.get('name', rule['field'])!r} needs 'set' or 'scale'")
+        groups: Dict[str, List[str]] = {}
+        self._groups: Dict[str, List[Tuple[int, str]]] = {}
+        for j, rule in enumerate(self.rules):
+            name = f"r{j}"
+            alternation = "|".join(re.escape(k.lower()) for k in rule["keywords"])
+            groups.setdefault(rule["field"], []).append(f"(?=.*?(?P<{name}>{alternation}))?")
+            self._groups.setdefault(rule["field"], []).append((j, name))
+        self._matchers = {field: re.compile("".join(parts), re.DOTALL) for field, parts in groups.items()}
+
+    def evaluate(self, records: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Return a (rows, rules) boolean mask of which keyword rules fire for each row."""
+        mask = np.zeros((len(records), len(self.rules)), dtype=bool)
+        for field, matcher in self._matchers.items():
+            groups = self._groups[field]
+            for i, record in enumerate(records):
+                m = matcher.match((record.get(field) or "").lower())
+                for j, name in groups:
+                    mask[i, j] = m.group(name) is not None
+        return mask
+
+    def adjust(self, records: Sequence[Dict[str, Any]], base: Sequence[float]) -> np.ndarray:
+        priors = np.tile(np.asarray(base, dtype=float), (len(records), 1))
+        mask = self.evaluate(records)
+        for j, rule in enumerate(self.rules):
+            hit = mask[:, j]
+            if "set" in rule:
+                priors[hit] = rule["set"]
+            if "scale" in rule:
+                priors[hit] *= rule["scale"]
+        return priors / priors.sum(axis=1, keepdims=True)
@@ -0,0 +1,42 @@
+from typing import Any, Iterable, Iterator, Tuple
+from flask import Response, current_app, stream_with_context
+
+STREAM_FORMATS = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+def _encode(fmt: str, event: str, data: Any) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {current_app.json.dumps(data)}\n\n"
+    return current_app.json.dumps({"event": event, "data": data}) + "\n"
+
+def _guarded(events: Iterable[Tuple[str, Any]], fmt: str, name: str) -> Iterator[str]:
+    # The WSGI server pulls one chunk at a time, so work only advances as fast as the
+    # client reads. On disconnect the server closes this generator, which closes the
+    # producer at its current yield and cancels the remaining work.
+    sent = 0
+    completed = False
+    try:
+        for event, data in events:
+            yield _encode(fmt, event, data)
+            sent += 1
+        completed = True
+        yield _encode(fmt, "done", {"events": sent})
+    except GeneratorExit:
+        current_app.logger.info("%s stream cancelled by client after %d events", name, sent)
+        raise
+    except Exception as exc:
+        current_app.logger.exception("%s stream failed: %s", name, exc)
+        yield _encode(fmt, "error", {"error": "Stream failed"})
+    finally:
+        if not completed and hasattr(events, "close"):
+            events.close()
+
+def stream_events(events: Iterable[Tuple[str, Any]], fmt: str, name: str) -> Response:
+    """Stream ``(event, data)`` pairs as server-sent events or NDJSON."""
+    resp = Response(stream_with_context(_guarded(events, fmt, name)), mimetype=STREAM_FORMATS[fmt])
+    resp.headers["Cache-Control"] = "no-cache"
+    # Stop nginx and similar proxies from buffering the whole stream
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp